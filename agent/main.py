@@ -18,6 +18,8 @@ from ingestions import main as data_model
 from sqlmodel import Session
 import logging
 from db.database import engine
+from calculator import main as calculator
+from agent.routing import LLMRouter, Provider, CircuitBreaker
 
 
 logging.basicConfig(level=logging.INFO)
@@ -140,16 +142,99 @@ def count_auctions(instrument: str, tenure: int):
     return auctions
 
 
-tools = [next_auction, last_auction, count_auctions, get_calendar, last_auction_offer]
+@tool
+def investment_return(instrument: str, tenure: int, amount: float):
+    """Calculate the exact return on investing an amount in the last auction of a given instrument, including coupons and withholding tax. The instrument must be 'Bond' or 'Bill'."""
+    if amount <= 0:
+        return "The amount to invest must be greater than zero."
+    with Session(engine) as session:
+        auction = data_model.last_auction_offer(instrument, tenure, session)
+    if not auction:
+        return "No auction found for this instrument and tenure."
+
+    returns = calculator.calculate_returns([auction], amount)
+    text = calculator.returns_to_text(calculator.summary_rows([auction], returns)[0])
+    schedule = calculator.coupon_schedule(auction, returns)
+    if len(schedule) > 1:
+        text += " Cash flows: " + "; ".join(
+            f"{flow['date'].strftime('%Y-%m-%d')}: {flow['gross']:,.0f}"
+            f"{' (principal)' if flow['principal'] else ''}"
+            for flow in schedule
+        )
+    return text
+
+
+@tool
+def compare_investments(amount: float, instrument: str | None = None):
+    """Compare the return on investing an amount across the latest auction of every tenure, best net return first. The instrument, if given, must be 'Bond' or 'Bill'."""
+    if amount <= 0:
+        return "The amount to invest must be greater than zero."
+    with Session(engine) as session:
+        auctions = data_model.latest_auction_results(session, instrument)
+    if not auctions:
+        return "No auction results found."
+
+    return "\n".join(
+        calculator.returns_to_text(row)
+        for row in calculator.compare_returns(auctions, amount)
+    )
+
+
+tools = [
+    next_auction,
+    last_auction,
+    count_auctions,
+    get_calendar,
+    last_auction_offer,
+    investment_return,
+    compare_investments,
+]
+
+
+def build_router() -> LLMRouter:
+    """Groq first, with an optional OpenAI-compatible provider for hedging and fallback."""
+    timeout = float(config.get("LLM_TIMEOUT", 20))
+    hedge_after = config.get("LLM_HEDGE_AFTER", "2")
+    breaker_failures = int(config.get("LLM_BREAKER_FAILURES", 3))
+    breaker_reset = float(config.get("LLM_BREAKER_RESET", 30))
+
+    providers = [
+        Provider(
+            "groq",
+            ChatGroq(
+                model=config["GROQ_MODEL"],
+                api_key=config.get("GROQ_API_KEY"),
+                temperature=0,
+                timeout=timeout,
+                max_retries=0,
+            ),
+            timeout=timeout,
+            breaker=CircuitBreaker(breaker_failures, breaker_reset),
+        )
+    ]
+    if config.get("OPENAI_MODEL"):
+        providers.append(
+            Provider(
+                "openai",
+                ChatOpenAI(
+                    model=config["OPENAI_MODEL"],
+                    api_key=config.get("OPENAI_API_KEY"),
+                    base_url=config.get("OPENAI_BASE_URL"),
+                    temperature=0,
+                    timeout=timeout,
+                    max_retries=0,
+                ),
+                timeout=timeout,
+                breaker=CircuitBreaker(breaker_failures, breaker_reset),
+            )
+        )
+
+    return LLMRouter(providers, hedge_after=float(hedge_after) if hedge_after else None)
 
 
-def build_graph():
+def build_graph(router: LLMRouter | None = None):
 
-    llm = ChatGroq(
-        model=config["GROQ_MODEL"],
-        api_key=config.get("GROQ_API_KEY"),
-        temperature=0,
-    ).bind_tools(tools)
+    llm = (router or build_router()).bind_tools(tools)
 
     structured_llm = llm.with_structured_output(AuctionQuery)
 
@@ -225,6 +310,7 @@ Your responses must clearly include:
             - Use `last_auction` or `next_auction` for date- and calendar-focused questions.
             - Use `last_auction_offer` when the user asks about yields, offers, cut-off prices, bid amounts, or bid cover ratios.
             - Always prefer `last_auction_offer` if the question is about "yield" or "offer" details.
+            - Use `investment_return` when the user asks how much an amount invested will return, and `compare_investments` to compare returns across tenures. Never do this arithmetic yourself.
 
             Tense rules:  
             - For future auctions, say: "is scheduled for [date]"  
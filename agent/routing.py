@@ -0,0 +1,315 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeout,
+    wait,
+)
+from statistics import mean, quantiles
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+# How often `invoke` re-checks calls still queued behind a busy worker pool.
+QUEUE_POLL_INTERVAL = 0.05
+
+
+class AllProvidersFailed(RuntimeError):
+    pass
+
+
+class ProviderStats:
+    """Rolling latency and outcome counters for a single provider."""
+
+    def __init__(self, window: int = 500):
+        self.latencies = deque(maxlen=window)
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.successes += 1
+            self.latencies.append(latency)
+
+    def record_failure(self, timed_out: bool = False):
+        with self._lock:
+            self.failures += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def record_hedge_win(self):
+        with self._lock:
+            self.hedge_wins += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = list(self.latencies)
+            summary = {
+                "successes": self.successes,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "hedge_wins": self.hedge_wins,
+            }
+        if latencies:
+            cuts = (
+                quantiles(latencies, n=100, method="inclusive")
+                if len(latencies) > 1
+                else latencies * 99
+            )
+            summary.update(
+                mean_s=round(mean(latencies), 4),
+                p50_s=round(cuts[49], 4),
+                p95_s=round(cuts[94], 4),
+                p99_s=round(cuts[98], 4),
+            )
+        return summary
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures and lets a single
+    probe call through once `reset_after` seconds have passed."""
+
+    def __init__(self, failure_threshold: int = 3, reset_after: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half_open"
+        return "open"
+
+    def available(self) -> bool:
+        """Whether a call could go through, without claiming the probe."""
+        return self.state != "open"
+
+    def allow(self) -> bool:
+        """Claim permission to call; a half-open breaker's probe is used up."""
+        with self._lock:
+            if self.state == "open":
+                return False
+            if self.state == "half_open":
+                # Re-arm the timer so only one probe goes through at a time.
+                self.opened_at = time.monotonic()
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class Provider:
+    """A named chat model together with its breaker and latency stats.
+
+    Bound copies (tools, structured output) share the breaker and stats of
+    the provider they were derived from.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        client,
+        timeout: float = 20.0,
+        breaker: CircuitBreaker | None = None,
+        stats: ProviderStats | None = None,
+    ):
+        self.name = name
+        self.client = client
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = stats or ProviderStats()
+
+    def with_client(self, client) -> "Provider":
+        return Provider(self.name, client, self.timeout, self.breaker, self.stats)
+
+
+class _Attempt:
+    """One provider call; its clock starts when a worker picks it up."""
+
+    def __init__(self, provider: Provider):
+        self.provider = provider
+        self.started = None
+        self.abandoned = threading.Event()
+
+    @property
+    def deadline(self) -> float | None:
+        if self.started is None:
+            return None
+        return self.started + self.provider.timeout
+
+
+class LLMRouter:
+    """Routes `invoke` calls across providers in priority order.
+
+    The first available provider is called; if it has not answered after
+    `hedge_after` seconds the next available provider is fired as well and
+    whichever answers first wins. Failed or timed out providers trip their
+    circuit breaker and the call falls through to the remaining providers.
+    When every breaker is open the call fails at once.
+
+    Threads cannot be interrupted, so a call that loses a hedge or times out
+    keeps its worker until the client's own HTTP timeout. Timeouts are only
+    counted from when a worker starts the call, so a busy pool delays calls
+    rather than tripping breakers; size `executor` for the expected
+    concurrency times the number of providers.
+    """
+
+    def __init__(
+        self,
+        providers: list[Provider],
+        hedge_after: float | None = 2.0,
+        executor: ThreadPoolExecutor | None = None,
+    ):
+        if not providers:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.providers = providers
+        self.hedge_after = hedge_after
+        # Copies context vars into workers so LangChain callbacks and tracing
+        # reach the provider calls.
+        self.executor = executor or ContextThreadPoolExecutor(
+            max_workers=4 * len(providers), thread_name_prefix="llm-router"
+        )
+
+    def bind_tools(self, tools, **kwargs) -> "LLMRouter":
+        return self._derive(lambda client: client.bind_tools(tools, **kwargs))
+
+    def with_structured_output(self, schema, **kwargs) -> "LLMRouter":
+        return self._derive(
+            lambda client: client.with_structured_output(schema, **kwargs)
+        )
+
+    def _derive(self, transform) -> "LLMRouter":
+        providers = [p.with_client(transform(p.client)) for p in self.providers]
+        return LLMRouter(providers, self.hedge_after, self.executor)
+
+    def stats(self) -> dict:
+        return {
+            p.name: {"circuit": p.breaker.state, **p.stats.snapshot()}
+            for p in self.providers
+        }
+
+    def _call(self, attempt: _Attempt, input, config, kwargs):
+        # Outcomes are recorded here, before the future resolves, so stats are
+        # up to date by the time `invoke` returns. Calls abandoned on timeout
+        # were already counted as failures.
+        provider = attempt.provider
+        attempt.started = time.monotonic()
+        try:
+            result = provider.client.invoke(input, config=config, **kwargs)
+        except Exception:
+            if not attempt.abandoned.is_set():
+                provider.breaker.record_failure()
+                provider.stats.record_failure()
+            raise
+        if not attempt.abandoned.is_set():
+            provider.breaker.record_success()
+            provider.stats.record_success(time.monotonic() - attempt.started)
+        return result
+
+    def _submit(self, provider: Provider, input, config, kwargs):
+        attempt = _Attempt(provider)
+        future = self.executor.submit(self._call, attempt, input, config, kwargs)
+        future.attempt = attempt
+        return future
+
+    @staticmethod
+    def _claim(queue: list[Provider]) -> Provider | None:
+        """Pop the next provider whose breaker lets a call through."""
+        while queue:
+            provider = queue.pop(0)
+            if provider.breaker.allow():
+                return provider
+        return None
+
+    def invoke(self, input, config=None, **kwargs):
+        queue = [p for p in self.providers if p.breaker.available()]
+        if not queue:
+            raise AllProvidersFailed(
+                "All LLM providers failed: every circuit breaker is open"
+            )
+
+        in_flight = {}
+        errors = []
+        while queue or in_flight:
+            if not in_flight:
+                provider = self._claim(queue)
+                if provider is None:
+                    break
+                in_flight[self._submit(provider, input, config, kwargs)] = provider
+
+            attempts = [f.attempt for f in in_flight]
+            running = [a for a in attempts if a.started is not None]
+            wake_at = min(
+                (a.deadline for a in running),
+                default=time.monotonic() + QUEUE_POLL_INTERVAL,
+            )
+            if len(running) < len(attempts):
+                wake_at = min(wake_at, time.monotonic() + QUEUE_POLL_INTERVAL)
+            hedge_at = None
+            if queue and running and self.hedge_after is not None:
+                hedge_at = max(a.started for a in running) + self.hedge_after
+                wake_at = min(wake_at, hedge_at)
+
+            done, _ = wait(
+                in_flight,
+                timeout=max(wake_at - time.monotonic(), 0.0),
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                provider = in_flight.pop(future)
+                if future.exception() is not None:
+                    logging.warning(
+                        f"LLM provider {provider.name} failed: {future.exception()}"
+                    )
+                    errors.append((provider.name, future.exception()))
+                    continue
+                if in_flight:
+                    provider.stats.record_hedge_win()
+                for loser in in_flight:
+                    # Only stops losers still queued; running ones finish in
+                    # the background and are recorded as normal.
+                    loser.cancel()
+                return future.result()
+
+            now = time.monotonic()
+            expired = [
+                f
+                for f in in_flight
+                if f.attempt.deadline is not None and f.attempt.deadline <= now
+            ]
+            for future in expired:
+                provider = in_flight.pop(future)
+                future.attempt.abandoned.set()
+                provider.breaker.record_failure()
+                provider.stats.record_failure(timed_out=True)
+                logging.warning(
+                    f"LLM provider {provider.name} timed out after {provider.timeout}s"
+                )
+                errors.append((provider.name, FutureTimeout()))
+
+            if hedge_at is not None and in_flight and queue and now >= hedge_at:
+                provider = self._claim(queue)
+                if provider is not None:
+                    logging.info(f"Hedging LLM request to {provider.name}")
+                    in_flight[self._submit(provider, input, config, kwargs)] = provider
+
+        raise AllProvidersFailed(
+            "All LLM providers failed: "
+            + ", ".join(f"{name}: {err!r}" for name, err in errors)
+        )
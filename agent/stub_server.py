@@ -0,0 +1,117 @@
+"""A local stand-in for an OpenAI-compatible chat completions endpoint.
+
+Used to exercise `agent.routing` offline: point a `ChatOpenAI` client at
+`server.base_url` and control latency and failures per server.
+
+    with StubOpenAIServer(delay=1.5) as slow, StubOpenAIServer() as fast:
+        ...
+"""
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubOpenAIServer:
+    def __init__(
+        self,
+        reply: str = "stub reply",
+        delay: float = 0.0,
+        status: int = 200,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.reply = reply
+        # Seconds to sleep before answering; can be changed while running.
+        self.delay = delay
+        # Non-200 values make every request fail with that status code.
+        self.status = status
+        self.requests = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubOpenAIServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def completion(self, model: str) -> dict:
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": self.reply},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                stub.requests += 1
+
+                # A per-request override lets a single call be slowed down.
+                delay = float(self.headers.get("X-Stub-Delay", stub.delay))
+                time.sleep(delay)
+
+                if not self.path.endswith("/chat/completions"):
+                    return self._send(404, {"error": {"message": "not found"}})
+                if stub.status != 200:
+                    return self._send(
+                        stub.status, {"error": {"message": "stub failure"}}
+                    )
+                self._send(200, stub.completion(body.get("model", "stub-model")))
+
+            def _send(self, status: int, payload: dict):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--status", type=int, default=200)
+    args = parser.parse_args()
+
+    server = StubOpenAIServer(delay=args.delay, status=args.status, port=args.port)
+    print(f"Stub OpenAI server listening on {server.base_url}")
+    server._server.serve_forever()
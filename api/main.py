@@ -2,9 +2,10 @@ from fastapi import FastAPI, UploadFile, File, Depends
 from db.database import get_session, create_db_and_tables
 import shutil
 from ingestions import main as ingestions
+from calculator import main as calculator
 from contextlib import asynccontextmanager
-from agent.main import build_graph
-from pydantic import BaseModel
+from agent.main import build_graph, build_router
+from pydantic import BaseModel, Field
 from langchain_core.messages import AIMessage, HumanMessage
 import logging
 from langgraph.checkpoint.memory import MemorySaver
@@ -17,7 +18,8 @@ memory_db = {}
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_db_and_tables()
-    app.state.compiled_graph = build_graph()
+    app.state.llm_router = build_router()
+    app.state.compiled_graph = build_graph(app.state.llm_router)
     yield
 
 
@@ -29,6 +31,17 @@ class ChatRequest(BaseModel):
     user_id: str | None = "default_user"
 
 
+class Investment(BaseModel):
+    instrument: str
+    tenure: int
+    amount: float = Field(gt=0)
+
+
+class ReturnsRequest(BaseModel):
+    investments: list[Investment]
+    withholding_tax: float = Field(default=calculator.WITHHOLDING_TAX, ge=0, lt=1)
+
+
 @app.post("/upload-calendar/")
 async def upload_calendar(file: UploadFile = File(...), session=Depends(get_session)):
     temp_file = f"/tmp/{file.filename}"
@@ -44,6 +57,39 @@ async def upload_calendar(file: UploadFile = File(...), session=Depends(get_sess
     return {"message": "Data inserted successfully", "rows": len(df)}
 
 
+@app.post("/calculate-returns/")
+async def calculate_returns(req: ReturnsRequest, session=Depends(get_session)):
+    """Calculate returns for a batch of investments against their last auction results.
+
+    Results come back in request order, with `result` set to None for
+    investments that have no auction result.
+    """
+    latest = {
+        (auction.instrument, auction.tenure): auction
+        for auction in ingestions.latest_auction_results(session)
+    }
+    auctions, amounts, positions = [], [], []
+    for position, investment in enumerate(req.investments):
+        auction = latest.get((investment.instrument, investment.tenure))
+        if auction:
+            auctions.append(auction)
+            amounts.append(investment.amount)
+            positions.append(position)
+
+    results = [None] * len(req.investments)
+    if auctions:
+        returns = calculator.calculate_returns(auctions, amounts, req.withholding_tax)
+        for position, row in zip(positions, calculator.summary_rows(auctions, returns)):
+            results[position] = row
+
+    return {
+        "results": [
+            {**investment.model_dump(), "found": result is not None, "result": result}
+            for investment, result in zip(req.investments, results)
+        ]
+    }
+
+
 @app.post("/chat/")
 async def chat_agent(msg: ChatRequest):
     """Get the chat for a given instrument."""
@@ -59,3 +105,9 @@ async def chat_agent(msg: ChatRequest):
         {"messages": [HumanMessage(content=msg.message)]}, config=config
     )
     return AIMessage(content=resp["messages"][-1].content)
+
+
+@app.get("/llm-stats/")
+async def llm_stats():
+    """Per-provider latency, failure and circuit breaker state."""
+    return app.state.llm_router.stats()
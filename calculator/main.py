@@ -0,0 +1,247 @@
+from datetime import date
+from typing import Sequence
+import numpy as np
+from db.model import AuctionResult
+
+# BoU quotes bill yields on a 364-day year; bonds pay coupons semi-annually.
+BILL_DAY_BASIS = 364
+COUPONS_PER_YEAR = 2
+WITHHOLDING_TAX = 0.15
+
+
+def _coupon_dates(settlement: np.ndarray, maturity: np.ndarray) -> np.ndarray:
+    """Coupon dates for each instrument, one row per instrument.
+
+    Dates are stepped back six months at a time from maturity, keeping the
+    maturity day of month (clipped for short months). Column 0 is the
+    maturity date; every row reaches back to at least one date on or before
+    settlement, which is the previous coupon date.
+    """
+    maturity_month = maturity.astype("datetime64[M]")
+    settlement_month = settlement.astype("datetime64[M]")
+    day_of_month = (maturity - maturity_month.astype("datetime64[D]")).astype(int)
+
+    months_left = (maturity_month - settlement_month).astype(int)
+    slots = int(months_left.max(initial=0)) // 6 + 2
+    step = 12 // COUPONS_PER_YEAR
+
+    months = maturity_month[:, None] - step * np.arange(slots)[None, :]
+    month_start = months.astype("datetime64[D]")
+    month_length = ((months + 1).astype("datetime64[D]") - month_start).astype(int)
+    dates = month_start + np.minimum(day_of_month[:, None], month_length - 1)
+
+    return dates
+
+
+def _price_from_yield(is_bill, ytm, rate, days, periods_to_coupon, coupon_mask):
+    """Dirty price per 100 implied by the yield, for results without a cut-off price."""
+    y = ytm / 100
+    bill_price = 100 / (1 + y * days / BILL_DAY_BASIS)
+
+    per_period = 1 + y[:, None] / COUPONS_PER_YEAR
+    discount = np.where(coupon_mask, per_period**-periods_to_coupon, 0.0)
+    # Column 0 is always the maturity date, where the principal is repaid.
+    bond_price = rate / COUPONS_PER_YEAR * discount.sum(axis=1) + 100 * discount[:, 0]
+
+    return np.where(is_bill, bill_price, bond_price)
+
+
+def calculate_returns(
+    auctions: Sequence[AuctionResult],
+    amounts: float | Sequence[float],
+    withholding_tax: float = WITHHOLDING_TAX,
+    settlement_date: date | None = None,
+) -> dict[str, np.ndarray]:
+    """Hold-to-maturity returns for many auction results at once.
+
+    `amounts` is the cash invested per instrument (a single value is applied
+    to all). Bills are bought at the cut-off price and repaid at face value;
+    bonds also pay semi-annual coupons at `rate`. Withholding tax is charged
+    on the bill discount and on bond coupons. Every value in the returned
+    dict is an array aligned with `auctions`.
+    """
+    n = len(auctions)
+    if n == 0:
+        return {}
+
+    settle = np.array(
+        [settlement_date or a.settlement_date for a in auctions], dtype="datetime64[D]"
+    )
+    maturity = np.array([a.maturity_date for a in auctions], dtype="datetime64[D]")
+    is_bill = np.array([a.instrument.strip().lower() == "bill" for a in auctions])
+    rate = np.array([a.rate or 0.0 for a in auctions], dtype=float)
+    ytm = np.array([a.yield_to_maturity or 0.0 for a in auctions], dtype=float)
+    cut_off_price = np.array([a.cut_off_price or 0.0 for a in auctions], dtype=float)
+    invested = np.broadcast_to(np.asarray(amounts, dtype=float), (n,)).copy()
+
+    days = (maturity - settle).astype(int)
+
+    all_dates = _coupon_dates(settle, maturity)
+    coupon_mask = (all_dates > settle[:, None]) & ~is_bill[:, None]
+    coupon_dates = np.where(coupon_mask, all_dates, np.datetime64("NaT"))
+    days_to_coupon = np.where(coupon_mask, (all_dates - settle[:, None]).astype(int), 0)
+    periods_to_coupon = days_to_coupon * COUPONS_PER_YEAR / 365
+
+    # Bond buyers pay the seller's share of the next coupon on top of the
+    # clean price, so the full first coupon is not all return.
+    rows = np.arange(n)
+    upcoming = coupon_mask.sum(axis=1)
+    next_coupon = all_dates[rows, np.maximum(upcoming - 1, 0)]
+    previous_coupon = all_dates[rows, upcoming]
+    period_days = (next_coupon - previous_coupon).astype(int)
+    accrued_days = (settle - previous_coupon).astype(int)
+    accrued = np.where(
+        is_bill, 0.0, rate / COUPONS_PER_YEAR * accrued_days / np.maximum(period_days, 1)
+    )
+
+    implied_price = _price_from_yield(
+        is_bill, ytm, rate, days, periods_to_coupon, coupon_mask
+    )
+    price = np.where(cut_off_price > 0, cut_off_price, implied_price - accrued)
+    dirty_price = price + accrued
+
+    face_value = invested * 100 / dirty_price
+    coupon_amount = face_value * rate / 100 / COUPONS_PER_YEAR
+    coupons = np.where(coupon_mask, coupon_amount[:, None], 0.0)
+    coupon_total = coupons.sum(axis=1)
+
+    discount = face_value - invested
+    taxable = np.where(is_bill, np.maximum(discount, 0.0), coupon_total)
+    tax = taxable * withholding_tax
+
+    gross_return = discount + coupon_total
+    net_return = gross_return - tax
+    years = np.maximum(days, 1) / 365
+
+    return {
+        "invested": invested,
+        "price": price,
+        "accrued_interest": face_value * accrued / 100,
+        "face_value": face_value,
+        "days_to_maturity": days,
+        "coupon_count": coupon_mask.sum(axis=1),
+        "coupon_total": coupon_total,
+        "gross_return": gross_return,
+        "withholding_tax": tax,
+        "withholding_tax_rate": np.full(n, withholding_tax),
+        "net_return": net_return,
+        "maturity_value": invested + gross_return,
+        "net_maturity_value": invested + net_return,
+        "gross_annual_return": gross_return / invested / years * 100,
+        "net_annual_return": net_return / invested / years * 100,
+        "coupon_dates": coupon_dates,
+        "coupons": coupons,
+    }
+
+
+def coupon_schedule(
+    auction: AuctionResult,
+    returns: dict[str, np.ndarray],
+    index: int = 0,
+) -> list[dict]:
+    """Dated cash flows (coupons plus principal) for one row of `calculate_returns`."""
+    withholding_tax = float(returns["withholding_tax_rate"][index])
+    dates = returns["coupon_dates"][index]
+    coupons = returns["coupons"][index]
+    face_value = float(returns["face_value"][index])
+    order = np.argsort(dates)
+
+    schedule = [
+        {
+            "date": dates[i].astype(date),
+            "gross": float(coupons[i]),
+            "net": float(coupons[i] * (1 - withholding_tax)),
+            "principal": False,
+        }
+        for i in order
+        if not np.isnat(dates[i]) and coupons[i] > 0
+    ]
+    schedule.append(
+        {
+            "date": auction.maturity_date,
+            "gross": face_value,
+            "net": face_value - float(returns["withholding_tax"][index])
+            if auction.instrument.strip().lower() == "bill"
+            else face_value,
+            "principal": True,
+        }
+    )
+    return schedule
+
+
+def summary_rows(
+    auctions: Sequence[AuctionResult], returns: dict[str, np.ndarray]
+) -> list[dict]:
+    """One summary row per instrument, in the same order as `auctions`."""
+    rows = []
+    for i, auction in enumerate(auctions):
+        rows.append(
+            {
+                "instrument": auction.instrument,
+                "tenure": auction.tenure,
+                "isin": auction.isin,
+                "currency": auction.currency,
+                "auction_date": auction.auction_date,
+                "maturity_date": auction.maturity_date,
+                "rate": auction.rate,
+                "yield_to_maturity": auction.yield_to_maturity,
+                "price": round(float(returns["price"][i]), 3),
+                **{
+                    key: round(float(returns[key][i]), 2)
+                    for key in (
+                        "invested",
+                        "accrued_interest",
+                        "face_value",
+                        "coupon_total",
+                        "gross_return",
+                        "withholding_tax",
+                        "net_return",
+                        "maturity_value",
+                        "net_maturity_value",
+                        "gross_annual_return",
+                        "net_annual_return",
+                    )
+                },
+                "days_to_maturity": int(returns["days_to_maturity"][i]),
+                "coupon_count": int(returns["coupon_count"][i]),
+            }
+        )
+    return rows
+
+
+def compare_returns(
+    auctions: Sequence[AuctionResult],
+    amounts: float | Sequence[float],
+    withholding_tax: float = WITHHOLDING_TAX,
+) -> list[dict]:
+    """Summary rows ranked by net annual return, best first."""
+    returns = calculate_returns(auctions, amounts, withholding_tax)
+    if not returns:
+        return []
+
+    rows = summary_rows(auctions, returns)
+    order = np.argsort(-returns["net_annual_return"], kind="stable")
+    return [rows[i] for i in order]
+
+
+def returns_to_text(row: dict) -> str:
+    """Render one `summary_rows` row as a sentence for the agent."""
+    currency = row["currency"]
+    unit = "day" if row["instrument"].strip().lower() == "bill" else "year"
+    text = (
+        f"Investing {currency} {row['invested']:,.0f} in the {row['tenure']}-{unit} "
+        f"{row['instrument']} (ISIN: {row['isin']}) at a price of {row['price']:.3f} "
+        f"buys a face value of {currency} {row['face_value']:,.0f}, maturing on "
+        f"{row['maturity_date'].strftime('%B %d, %Y')}. "
+    )
+    if row["coupon_count"]:
+        text += (
+            f"It pays {row['coupon_count']} coupons totalling "
+            f"{currency} {row['coupon_total']:,.0f}. "
+        )
+    return text + (
+        f"Total received is {currency} {row['maturity_value']:,.0f} before tax "
+        f"({currency} {row['net_maturity_value']:,.0f} after "
+        f"{currency} {row['withholding_tax']:,.0f} withholding tax), "
+        f"a net return of {row['net_annual_return']:.2f}% a year."
+    )
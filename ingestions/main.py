@@ -128,3 +128,18 @@ def count_auctions(instrument: str, tenure: int, session: Session):
     )
     result = session.exec(sql_statement).all()
     return len(result)
+
+
+def latest_auction_results(session: Session, instrument: str | None = None):
+    """Get the most recent auction result for every instrument and tenure."""
+    sql_statement = (
+        select(AuctionResult)
+        .where(AuctionResult.auction_date < today)
+        .order_by(AuctionResult.auction_date.desc())
+    )
+    if instrument:
+        sql_statement = sql_statement.where(AuctionResult.instrument == instrument)
+    latest = {}
+    for result in session.exec(sql_statement).all():
+        latest.setdefault((result.instrument, result.tenure), result)
+    return list(latest.values())
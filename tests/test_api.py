@@ -0,0 +1,94 @@
+from datetime import date
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+from api.main import app
+from db.database import get_session
+from db.model import AuctionResult
+
+
+def result(instrument, tenure, auction_date, maturity, ytm):
+    return AuctionResult(
+        auction_date=auction_date,
+        settlement_date=date(2025, 8, 11),
+        maturity_date=maturity,
+        instrument=instrument,
+        tenure=tenure,
+        isin=f"UG-{instrument}-{tenure}-{auction_date.isoformat()}",
+        rate=0.0,
+        cut_off_price=0.0,
+        yield_to_maturity=ytm,
+        offered=0,
+        tendered=0,
+        competitive_offer=0,
+        non_competitive_offer=0,
+        accepted_bids=0,
+        accepted_competitive_bids=0,
+        accepted_non_competitive_bids=0,
+        bid_cover_ratio=0.0,
+    )
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(result("Bill", 182, date(2025, 7, 24), date(2026, 2, 9), 15.0))
+        session.add(result("Bill", 182, date(2025, 8, 7), date(2026, 2, 9), 14.75))
+        session.add(result("Bill", 91, date(2025, 8, 7), date(2025, 11, 10), 12.0))
+        session.commit()
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = session_override
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_calculate_returns_keeps_request_order(client):
+    response = client.post(
+        "/calculate-returns/",
+        json={
+            "investments": [
+                {"instrument": "Bill", "tenure": 182, "amount": 10_000_000},
+                {"instrument": "Bond", "tenure": 99, "amount": 1_000_000},
+                {"instrument": "Bill", "tenure": 91, "amount": 2_000_000},
+                {"instrument": "Bill", "tenure": 182, "amount": 5_000_000},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [(r["instrument"], r["tenure"], r["amount"]) for r in results] == [
+        ("Bill", 182, 10_000_000),
+        ("Bond", 99, 1_000_000),
+        ("Bill", 91, 2_000_000),
+        ("Bill", 182, 5_000_000),
+    ]
+    assert [r["found"] for r in results] == [True, False, True, True]
+    assert results[1]["result"] is None
+    # The latest 182-day auction is used, not the earlier one.
+    assert results[0]["result"]["yield_to_maturity"] == 14.75
+    assert results[0]["result"]["net_maturity_value"] == pytest.approx(10_626_875)
+    assert results[3]["result"]["invested"] == 5_000_000
+    assert results[2]["result"]["tenure"] == 91
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"investments": [{"instrument": "Bill", "tenure": 182, "amount": 0}]},
+        {"investments": [], "withholding_tax": 1},
+    ],
+)
+def test_calculate_returns_rejects_invalid_input(client, body):
+    assert client.post("/calculate-returns/", json=body).status_code == 422
@@ -0,0 +1,149 @@
+from datetime import date
+import numpy as np
+import pytest
+from calculator import main as calculator
+from db.model import AuctionResult
+
+
+def auction(instrument, settlement, maturity, rate=0.0, cut_off_price=0.0, ytm=0.0):
+    return AuctionResult(
+        auction_date=settlement,
+        settlement_date=settlement,
+        maturity_date=maturity,
+        instrument=instrument,
+        tenure=182 if instrument == "Bill" else 2,
+        isin=f"UG-{instrument}-{maturity.isoformat()}",
+        rate=rate,
+        cut_off_price=cut_off_price,
+        yield_to_maturity=ytm,
+        offered=0,
+        tendered=0,
+        competitive_offer=0,
+        non_competitive_offer=0,
+        accepted_bids=0,
+        accepted_competitive_bids=0,
+        accepted_non_competitive_bids=0,
+        bid_cover_ratio=0.0,
+    )
+
+
+def coupon_dates(returns, index=0):
+    dates = returns["coupon_dates"][index]
+    return sorted(d.astype(date) for d in dates if not np.isnat(d))
+
+
+def test_182_day_bill_from_yield():
+    # 182 days on BoU's 364-day basis. sampleUserInteraction.md's "about
+    # UGX 11.47M" applies a full year's yield and is deliberately not matched.
+    bill = auction("Bill", date(2025, 8, 11), date(2026, 2, 9), ytm=14.75)
+
+    returns = calculator.calculate_returns([bill], 10_000_000)
+
+    assert returns["days_to_maturity"][0] == 182
+    assert returns["coupon_count"][0] == 0
+    assert returns["maturity_value"][0] == pytest.approx(10_737_500)
+    assert returns["withholding_tax"][0] == pytest.approx(110_625)
+    assert returns["net_maturity_value"][0] == pytest.approx(10_626_875)
+
+    schedule = calculator.coupon_schedule(bill, returns)
+    assert len(schedule) == 1
+    assert schedule[0]["principal"]
+    assert schedule[0]["net"] == pytest.approx(10_626_875)
+
+
+def test_bond_bought_between_coupons_pays_accrued_interest():
+    bond = auction(
+        "Bond", date(2025, 8, 11), date(2027, 5, 15), rate=12.0, cut_off_price=100.0
+    )
+
+    returns = calculator.calculate_returns([bond], 10_000_000)
+
+    # Previous coupon 2025-05-15, next 2025-11-15: 88 of 184 days accrued.
+    accrued = 6.0 * 88 / 184
+    face_value = 10_000_000 * 100 / (100 + accrued)
+    assert returns["face_value"][0] == pytest.approx(face_value)
+    assert returns["accrued_interest"][0] == pytest.approx(face_value * accrued / 100)
+    assert returns["coupon_count"][0] == 4
+    assert coupon_dates(returns) == [
+        date(2025, 11, 15),
+        date(2026, 5, 15),
+        date(2026, 11, 15),
+        date(2027, 5, 15),
+    ]
+    assert returns["coupon_total"][0] == pytest.approx(4 * face_value * 0.06)
+    assert returns["withholding_tax"][0] == pytest.approx(
+        0.15 * returns["coupon_total"][0]
+    )
+
+
+def test_schedule_uses_the_tax_rate_of_its_returns():
+    bond = auction(
+        "Bond", date(2025, 8, 11), date(2027, 5, 15), rate=12.0, cut_off_price=100.0
+    )
+    bill = auction("Bill", date(2025, 8, 11), date(2026, 2, 9), ytm=14.75)
+
+    returns = calculator.calculate_returns([bond, bill], 10_000_000, 0.1)
+
+    coupons = calculator.coupon_schedule(bond, returns, 0)[:-1]
+    assert sum(flow["gross"] - flow["net"] for flow in coupons) == pytest.approx(
+        returns["withholding_tax"][0]
+    )
+    principal = calculator.coupon_schedule(bill, returns, 1)[-1]
+    assert principal["net"] == pytest.approx(returns["net_maturity_value"][1])
+
+
+def test_month_end_maturity_clips_coupon_dates():
+    bond = auction(
+        "Bond", date(2025, 8, 11), date(2028, 8, 31), rate=12.0, cut_off_price=100.0
+    )
+
+    returns = calculator.calculate_returns([bond], 1_000_000)
+
+    assert coupon_dates(returns) == [
+        date(2025, 8, 31),
+        date(2026, 2, 28),
+        date(2026, 8, 31),
+        date(2027, 2, 28),
+        date(2027, 8, 31),
+        date(2028, 2, 29),
+        date(2028, 8, 31),
+    ]
+
+
+def test_bond_priced_from_yield_without_cut_off_price():
+    at_par = auction("Bond", date(2025, 8, 31), date(2027, 8, 31), rate=12.0, ytm=12.0)
+    at_discount = auction(
+        "Bond", date(2025, 8, 31), date(2027, 8, 31), rate=12.0, ytm=14.0
+    )
+
+    returns = calculator.calculate_returns([at_par, at_discount], 1_000_000)
+
+    assert returns["accrued_interest"][0] == pytest.approx(0.0)
+    assert returns["price"][0] == pytest.approx(100.0, abs=0.1)
+    assert returns["price"][1] < 97.0
+    assert returns["coupon_count"].tolist() == [4, 4]
+
+
+def test_mixed_batch_keeps_rows_aligned():
+    bond = auction(
+        "Bond", date(2025, 8, 11), date(2027, 5, 15), rate=12.0, cut_off_price=100.0
+    )
+    bill = auction("Bill", date(2025, 8, 11), date(2026, 2, 9), ytm=14.75)
+    long_bond = auction(
+        "Bond", date(2025, 8, 11), date(2035, 2, 28), rate=15.0, cut_off_price=97.5
+    )
+    auctions = [bond, bill, long_bond]
+
+    returns = calculator.calculate_returns(auctions, [1e6, 2e6, 3e6])
+
+    assert returns["invested"].tolist() == [1e6, 2e6, 3e6]
+    assert returns["coupon_count"].tolist() == [4, 0, 20]
+    assert returns["maturity_value"][1] == pytest.approx(2e6 * 1.07375)
+
+    rows = calculator.summary_rows(auctions, returns)
+    assert [row["isin"] for row in rows] == [a.isin for a in auctions]
+    assert [row["invested"] for row in rows] == [1e6, 2e6, 3e6]
+
+    ranked = calculator.compare_returns(auctions, [1e6, 2e6, 3e6])
+    net = [row["net_annual_return"] for row in ranked]
+    assert net == sorted(net, reverse=True)
@@ -0,0 +1,188 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+import pytest
+from langchain_openai import ChatOpenAI
+from agent.routing import AllProvidersFailed, CircuitBreaker, LLMRouter, Provider
+from agent.stub_server import StubOpenAIServer
+
+
+@pytest.fixture
+def slow():
+    with StubOpenAIServer(reply="slow", delay=1.0) as server:
+        yield server
+
+
+@pytest.fixture
+def failing():
+    with StubOpenAIServer(reply="failing", status=500) as server:
+        yield server
+
+
+@pytest.fixture
+def fast():
+    with StubOpenAIServer(reply="fast") as server:
+        yield server
+
+
+def provider(name, server, timeout=5.0, breaker=None):
+    client = ChatOpenAI(
+        model="stub-model",
+        api_key="test",
+        base_url=server.base_url,
+        timeout=timeout,
+        max_retries=0,
+    )
+    return Provider(name, client, timeout=timeout, breaker=breaker)
+
+
+def test_hedge_fires_and_faster_provider_wins(slow, fast):
+    router = LLMRouter(
+        [provider("slow", slow), provider("fast", fast)], hedge_after=0.2
+    )
+
+    response = router.invoke("hi")
+
+    # The slow call was still in flight when the hedge answered.
+    assert response.content == "fast"
+    assert slow.requests == 1 and fast.requests == 1
+    stats = router.stats()
+    assert stats["fast"]["hedge_wins"] == 1
+    assert stats["fast"]["successes"] == 1
+    assert stats["slow"]["successes"] == 0
+
+
+def test_no_hedge_when_primary_answers_in_time(fast, slow):
+    router = LLMRouter(
+        [provider("fast", fast), provider("slow", slow)], hedge_after=0.5
+    )
+
+    assert router.invoke("hi").content == "fast"
+    assert slow.requests == 0
+
+
+def test_timeout_falls_back_to_next_provider(slow, fast):
+    router = LLMRouter(
+        [provider("slow", slow, timeout=0.3), provider("fast", fast)],
+        hedge_after=None,
+    )
+
+    assert router.invoke("hi").content == "fast"
+    stats = router.stats()
+    assert stats["slow"]["timeouts"] == 1
+    assert stats["slow"]["failures"] == 1
+    assert stats["fast"]["successes"] == 1
+
+
+def test_failure_falls_back_to_next_provider(failing, fast):
+    router = LLMRouter(
+        [provider("failing", failing), provider("fast", fast)], hedge_after=None
+    )
+
+    assert router.invoke("hi").content == "fast"
+    assert router.stats()["failing"]["failures"] == 1
+
+
+def test_all_providers_failing_raises(failing):
+    router = LLMRouter([provider("failing", failing)], hedge_after=None)
+
+    with pytest.raises(AllProvidersFailed):
+        router.invoke("hi")
+
+
+def test_breaker_opens_goes_half_open_and_closes(failing, fast):
+    breaker = CircuitBreaker(failure_threshold=2, reset_after=0.3)
+    router = LLMRouter(
+        [provider("failing", failing, breaker=breaker), provider("fast", fast)],
+        hedge_after=None,
+    )
+
+    router.invoke("hi")
+    assert breaker.state == "closed"
+    router.invoke("hi")
+    assert breaker.state == "open"
+
+    # While open the primary is skipped entirely.
+    router.invoke("hi")
+    assert failing.requests == 2
+
+    time.sleep(0.35)
+    assert breaker.state == "half_open"
+    failing.status = 200
+    assert router.invoke("hi").content == "failing"
+    assert breaker.state == "closed"
+    assert router.stats()["failing"]["circuit"] == "closed"
+
+
+def test_half_open_probe_not_spent_on_unused_provider(fast, failing):
+    backup_breaker = CircuitBreaker(failure_threshold=1, reset_after=0.2)
+    backup_breaker.record_failure()
+    router = LLMRouter(
+        [provider("primary", failing), provider("backup", fast, breaker=backup_breaker)],
+        hedge_after=None,
+    )
+    failing.status = 200
+
+    time.sleep(0.25)
+    assert backup_breaker.state == "half_open"
+    assert router.invoke("hi").content == "failing"
+    assert fast.requests == 0
+    assert backup_breaker.state == "half_open"
+
+    failing.status = 500
+    assert router.invoke("hi").content == "fast"
+    assert backup_breaker.state == "closed"
+
+
+def test_open_breaker_fails_fast_without_calling_provider(failing):
+    breaker = CircuitBreaker(failure_threshold=1, reset_after=60)
+    router = LLMRouter(
+        [provider("failing", failing, breaker=breaker)], hedge_after=None
+    )
+
+    with pytest.raises(AllProvidersFailed):
+        router.invoke("hi")
+    assert breaker.state == "open"
+
+    for _ in range(3):
+        with pytest.raises(AllProvidersFailed):
+            router.invoke("hi")
+    assert failing.requests == 1
+
+
+def test_queued_calls_are_not_charged_as_timeouts(fast):
+    executor = ThreadPoolExecutor(max_workers=1)
+    router = LLMRouter(
+        [provider("fast", fast, timeout=0.3)], hedge_after=None, executor=executor
+    )
+
+    # Saturate the pool for longer than the provider timeout.
+    executor.submit(time.sleep, 0.6)
+    assert router.invoke("hi").content == "fast"
+    stats = router.stats()["fast"]
+    assert stats["timeouts"] == 0
+    assert stats["circuit"] == "closed"
+
+
+def test_context_vars_reach_provider_calls():
+    request_id = ContextVar("request_id", default=None)
+
+    class Recorder:
+        seen = None
+
+        def invoke(self, input, config=None, **kwargs):
+            Recorder.seen = request_id.get()
+            return input
+
+    router = LLMRouter([Provider("recorder", Recorder())], hedge_after=None)
+
+    request_id.set("abc")
+    router.invoke("hi")
+    assert Recorder.seen == "abc"
+
+
+def test_bound_copies_share_stats(fast):
+    router = LLMRouter([provider("fast", fast)], hedge_after=None)
+
+    router.bind_tools([]).invoke("hi")
+    assert router.stats()["fast"]["successes"] == 1